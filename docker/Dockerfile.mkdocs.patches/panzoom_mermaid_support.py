@@ -1,3 +1,8 @@
+    # Anchors searched in the rendered page
+    tag_head = "</head>"
+    tag_mermaid_begin = '<pre><div class="mermaid">'
+    tag_mermaid_end = "</div></pre>"
+
     def on_post_page(self, output: str, /, *, page, config):
 
         excluded_pages = self.config.get("exclude",[])
@@ -5,19 +10,36 @@
         if exclude(page.file.src_path,excluded_pages):
             return
 
-        html_page = re.sub(r"(<\/head>)", f"{create_meta_tags(config)} \\1", output, count=1)
+        # Meta tags are injected before the first </head>
+        pos_head = output.find(self.tag_head)
+        meta_tags = f"{create_meta_tags(config)} "
+
+        def segment(begin, end):
+            if begin <= pos_head < end:
+                return output[begin:pos_head] + meta_tags + output[pos_head:end]
+            return output[begin:end]
 
-        # Wrap mermaid and d2 diagrams in panzoom boxes
-        from mkdocs_panzoom_plugin.panzoom_box import create_panzoom_box
+        # Wrap mermaid and d2 diagrams in panzoom boxes, walking the page once
+        parts = []
         box_id = 0
+        pos = 0
 
         # Wrap mermaid diagrams
         if ".mermaid" in config.get("selectors", []):
-            def wrap_mermaid(match):
-                nonlocal box_id
+            while True:
+                begin = output.find(self.tag_mermaid_begin, pos)
+                if begin < 0:
+                    break
+                end = output.find(self.tag_mermaid_end, begin + len(self.tag_mermaid_begin))
+                if end < 0:
+                    break
+                end += len(self.tag_mermaid_end)
                 box = create_panzoom_box(self.config, box_id)
                 box_id += 1
-                return box.replace("\\1", match.group(0))
-            html_page = re.sub(r'<pre><div class="mermaid">.*?</div></pre>', wrap_mermaid, html_page, flags=re.DOTALL)
+                parts.append(segment(pos, begin))
+                parts.append(box.replace("\\1", segment(begin, end)))
+                pos = end
+
+        parts.append(segment(pos, len(output)))
 
-        return str(html_page)
+        return "".join(parts)
@@ -0,0 +1,48 @@
+#!/bin/python3
+
+from pathlib import Path
+from .common import BindTestBase
+from cli.test_runner import run_cmd, ExecSession
+
+class TestFimBindChange(BindTestBase):
+  """
+  Test suite for the contents of bound files:
+  - Write through read-write bindings
+  - Reject writes through read-only bindings
+  """
+
+  # ===========================================================================
+  # fim-bind file contents Tests
+  # ===========================================================================
+
+  def test_change_file_contents(self):
+    """Test modifying bound files (read-write binding)"""
+    test_file: Path = self.create_tmp("output")
+    test_file.write_text("written by the host")
+    # Bind
+    run_cmd(self.file_image, "fim-bind", "add", "rw", test_file, "/host/output")
+    with ExecSession(self.file_image) as session:
+      # Original content
+      out, err, code = session.run("cat", "/host/output")
+      self.assertEqual(out, "written by the host")
+      self.assertEqual(err, "")
+      self.assertEqual(code, 0)
+      # Writeable file
+      session.run("sh", "-c", "echo 'written by the container' > /host/output")
+      out, err, code = session.run("cat", "/host/output")
+      self.assertEqual(out, "written by the container")
+      self.assertEqual(err, "")
+      self.assertEqual(code, 0)
+
+  def test_readonly_file(self):
+    """Test read-only binding prevents writes"""
+    test_file: Path = self.create_tmp("output")
+    test_file.write_text("unchanged")
+    run_cmd(self.file_image, "fim-bind", "del", "0")
+    run_cmd(self.file_image, "fim-bind", "add", "ro", test_file, "/host/output")
+    with ExecSession(self.file_image) as session:
+      session.run("sh", "-c", "echo 'written by the container' > /host/output")
+      out, err, code = session.run("cat", "/host/output")
+      self.assertEqual(out.strip(), "unchanged")
+      self.assertEqual(err, "")
+      self.assertEqual(code, 0)
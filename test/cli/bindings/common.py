@@ -18,7 +18,7 @@ class BindTestBase(TestBase):
 
   def tearDown(self):
     super().tearDown()
-    shutil.rmtree(self.binding_dir, ignore_errors=False)
+    shutil.rmtree(self.binding_dir, ignore_errors=True)
 
   def create_tmp(self, name):
     """Create a temporary file for binding tests"""
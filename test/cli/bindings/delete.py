@@ -1,6 +1,5 @@
 #!/bin/python3
 
-import unittest
 from pathlib import Path
 from .common import BindTestBase
 from cli.test_runner import run_cmd
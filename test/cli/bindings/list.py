@@ -1,11 +1,8 @@
 #!/bin/python3
 
-import unittest
-import json
-import shutil
 from pathlib import Path
 from .common import BindTestBase
-from cli.test_runner import run_cmd
+from cli.test_runner import run_cmd, json_loads
 
 class TestFimBindList(BindTestBase):
   """
@@ -23,16 +20,17 @@ class TestFimBindList(BindTestBase):
     """Test listing all file bindings"""
     test_file_1: Path = self.create_tmp("output1")
     test_file_2: Path = self.create_tmp("output2")
+    src_1, src_2 = str(test_file_1), str(test_file_2)
     run_cmd(self.file_image, "fim-bind", "add", "ro", test_file_1, "/host/files/file_1")
     run_cmd(self.file_image, "fim-bind", "add", "ro", test_file_2, "/host/files/file_2")
     out, err, code = run_cmd(self.file_image, "fim-bind", "list")
     self.assertEqual(err, "")
     self.assertEqual(code, 0)
     # Check json output
-    parsed = json.loads(out)
-    self.assertEqual(parsed["0"]["src"], str(test_file_1))
+    parsed = json_loads(out)
+    self.assertEqual(parsed["0"]["src"], src_1)
     self.assertEqual(parsed["0"]["dst"], "/host/files/file_1")
-    self.assertEqual(parsed["1"]["src"], str(test_file_2))
+    self.assertEqual(parsed["1"]["src"], src_2)
     self.assertEqual(parsed["1"]["dst"], "/host/files/file_2")
     self.assertEqual(len(parsed), 2)
     # Extra arguments
@@ -1,8 +1,7 @@
 #!/bin/python3
 
-import json
-from .common import BootTestBase
-from cli.test_runner import run_cmd
+from .common import BootTestBase, DEFAULT_BOOT, BOOT_SET, BOOT_SHOW, BOOT_CLEAR
+from cli.test_runner import run_cmd, json_loads
 
 class TestFimBootClear(BootTestBase):
   """
@@ -19,39 +18,39 @@ class TestFimBootClear(BootTestBase):
   def test_boot_clear(self):
     """Test clear command resets boot configuration"""
     # Trailing arguments to clear
-    out, err, code = run_cmd(self.file_image, "fim-boot", "clear", "hello")
+    out, err, code = run_cmd(self.file_image, *BOOT_CLEAR, "hello")
     self.assertEqual(out, "")
     self.assertIn("Trailing arguments for fim-boot: ['hello',]", err)
     self.assertEqual(code, 125)
-    def boot_show(stdout="", stderr="", code=0):
+    def boot_show():
       # No arguments to show
-      out, err, code = run_cmd(self.file_image, "fim-boot", "show")
-      self.assertEqual(out, stdout)
-      self.assertEqual(err, stderr)
-      self.assertEqual(code, code)
+      out, err, code = run_cmd(self.file_image, *BOOT_SHOW)
+      self.assertEqual(json_loads(out), DEFAULT_BOOT)
+      self.assertEqual(err, "")
+      self.assertEqual(code, 0)
     def boot_clear():
-      out, err, code = run_cmd(self.file_image, "fim-boot", "clear")
+      out, err, code = run_cmd(self.file_image, *BOOT_CLEAR)
       self.assertEqual(out, "")
       self.assertEqual(err, "")
       self.assertEqual(code, 0)
     # No arguments to show
-    boot_show("""{\n  "args": [],\n  "program": "bash"\n}""")
+    boot_show()
     # Clear argument
     boot_clear()
     # Show default arguments
-    boot_show("""{\n  "args": [],\n  "program": "bash"\n}""")
+    boot_show()
     # Set argument
-    out, err, code = run_cmd(self.file_image, "fim-boot", "set", "bash", "-c", """echo "hello" "world\"""")
+    out, err, code = run_cmd(self.file_image, *BOOT_SET, "bash", "-c", """echo "hello" "world\"""")
     self.assertEqual(out, "")
     self.assertEqual(err, "")
     self.assertEqual(code, 0)
-    out, err, code = run_cmd(self.file_image, "fim-boot", "show")
+    out, err, code = run_cmd(self.file_image, *BOOT_SHOW)
     self.assertEqual(err, "")
     self.assertEqual(code, 0)
-    boot = json.loads(out)
+    boot = json_loads(out)
     self.assertEqual(boot["program"], "bash")
     self.assertEqual(boot["args"], ["-c", """echo "hello" "world\""""])
     # Clear argument
     boot_clear()
     # Show default arguments
-    boot_show("""{\n  "args": [],\n  "program": "bash"\n}""")
+    boot_show()
@@ -1,14 +1,21 @@
 #!/bin/python3
 
-import os
-import subprocess
-import unittest
-import shutil
 from cli.test_base import TestBase
 
+# Boot configuration shown by fim-boot show when none is set
+DEFAULT_BOOT = {"args": [], "program": "bash"}
+
+# Command prefixes shared by the boot tests
+BOOT_SET = ("fim-boot", "set")
+BOOT_SHOW = ("fim-boot", "show")
+BOOT_CLEAR = ("fim-boot", "clear")
+
 class BootTestBase(TestBase):
   """
   Base class for boot configuration tests providing shared utilities
+
+  The JSON printed by fim-boot show is compared after parsing, so the tests do
+  not depend on its whitespace or key order
   """
 
   def setUp(self):
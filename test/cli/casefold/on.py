@@ -2,7 +2,7 @@
 
 import os
 from .common import CasefoldTestBase
-from cli.test_runner import run_cmd
+from cli.test_runner import run_cmd, ExecSession
 
 class TestFimCasefoldOn(CasefoldTestBase):
   """Test suite for fim-casefold on command"""
@@ -15,20 +15,26 @@ class TestFimCasefoldOn(CasefoldTestBase):
       self.assertEqual(code, 0)
     out,err,code = run_cmd(self.file_image, "fim-casefold", "on")
     success(out,err,code)
-    out,err,code = run_cmd(self.file_image, "fim-exec", "mkdir", "-p", "/hElLo/WoRlD")
-    success(out,err,code)
-    out,err,code = run_cmd(self.file_image, "fim-exec", "stat", "/hello/world")
-    self.assertIn("File: /hello/world", out)
-    self.assertEqual(err, "")
-    self.assertEqual(code, 0)
-    out,err,code = run_cmd(self.file_image, "fim-exec", "stat", "/hEllO/WorlD")
-    self.assertIn("File: /hEllO/WorlD", out)
+    with ExecSession(self.file_image) as session:
+      out,err,code = session.run("mkdir", "-p", "/hElLo/WoRlD")
+      success(out,err,code)
+      out,err,code = session.run("stat", "/hello/world")
+      self.assertIn("File: /hello/world", out)
+      self.assertEqual(err, "")
+      self.assertEqual(code, 0)
+      out,err,code = session.run("stat", "/hEllO/WorlD")
+      self.assertIn("File: /hEllO/WorlD", out)
+      self.assertEqual(err, "")
+      self.assertEqual(code, 0)
+    # Casefold persists across boots
+    out,err,code = run_cmd(self.file_image, "fim-exec", "stat", "/HELLO/WORLD")
+    self.assertIn("File: /HELLO/WORLD", out)
     self.assertEqual(err, "")
     self.assertEqual(code, 0)
     os.environ["FIM_DEBUG"]="1"
     out,err,code = run_cmd(self.file_image, "fim-exec", "echo", "-n", "")
     self.assertIn("Overlay type: UNIONFS", out)
-    self.assertEqual([l for l in out.splitlines() if not l.startswith("D::") and not l.startswith("I::") and not len(l) == 0] , [])
+    self.assertEqual([l for l in out.splitlines() if l and not l.startswith(("D::", "I::"))], [])
     self.assertIn("casefold cannot be used with bwrap overlayfs, falling back to unionfs", err)
     self.assertEqual(code, 0)
     os.environ["FIM_DEBUG"]="0"
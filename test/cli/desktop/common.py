@@ -1,12 +1,70 @@
 #!/bin/python3
 
 import os
-import shutil
 import subprocess
 import unittest
-from pathlib import Path
-from cli.test_runner import run_cmd
-from cli.test_base import TestBase
+from cli.test_runner import run_cmd, json_loads
+from cli.test_base import TestBase, fast_rmtree
+
+# Desktop integration configuration, formatted with the integrations, name, data directory and icon extension
+DESKTOP_JSON_TEMPLATE = (
+  b"""{""" b"\n"
+  b"""  "integrations": [%b],""" b"\n"
+  b"""  "name": "%b",""" b"\n"
+  b"""  "icon": "%b/icon.%b",""" b"\n"
+  b"""  "categories": ["System", "Network"]""" b"\n"
+  b"""}""" b"\n"
+)
+
+# Sizes of the hicolor theme directories that receive the PNG icon
+ICON_SIZES = (16, 22, 24, 32, 48, 64, 96, 128, 256)
+
+# Generic FlatImage MIME type, shared by all applications
+MIME_GENERIC = (
+  b"""<?xml version="1.0" encoding="UTF-8"?>""" b"\n"
+  b"""<mime-info xmlns="http://www.freedesktop.org/standards/shared-mime-info">""" b"\n"
+  b"""  <mime-type type="application/flatimage">""" b"\n"
+  b"""    <comment>FlatImage Application</comment>""" b"\n"
+  b"""    <magic>""" b"\n"
+  b"""      <match value="ELF" type="string" offset="1">""" b"\n"
+  b"""        <match value="0x46" type="byte" offset="8">""" b"\n"
+  b"""          <match value="0x49" type="byte" offset="9">""" b"\n"
+  b"""            <match value="0x01" type="byte" offset="10"/>""" b"\n"
+  b"""          </match>""" b"\n"
+  b"""        </match>""" b"\n"
+  b"""      </match>""" b"\n"
+  b"""    </magic>""" b"\n"
+  b"""    <glob weight="50" pattern="*.flatimage"/>""" b"\n"
+  b"""    <sub-class-of type="application/x-executable"/>""" b"\n"
+  b"""    <generic-icon name="application-flatimage"/>""" b"\n"
+  b"""  </mime-type>""" b"\n"
+  b"""</mime-info>""" b"\n"
+)
+
+# Application MIME type, formatted with the application name and the file name of the image
+MIME_TEMPLATE = (
+  """<?xml version="1.0" encoding="UTF-8"?>""" "\n"
+  """<mime-info xmlns="http://www.freedesktop.org/standards/shared-mime-info">""" "\n"
+  """  <mime-type type="application/flatimage_{name}">""" "\n"
+  """    <comment>FlatImage Application</comment>""" "\n"
+  """    <glob weight="100" pattern="{pattern}"/>""" "\n"
+  """    <sub-class-of type="application/x-executable"/>""" "\n"
+  """    <generic-icon name="application-flatimage"/>""" "\n"
+  """  </mime-type>""" "\n"
+  """</mime-info>"""
+)
+
+# Desktop entry, formatted with the application name and the path to the image
+ENTRY_TEMPLATE = (
+  """[Desktop Entry]""" "\n"
+  """Name={name}""" "\n"
+  """Type=Application""" "\n"
+  '''Comment=FlatImage distribution of "{name}"''' "\n"
+  """Exec="{image}" %F""" "\n"
+  """Icon=flatimage_{name}""" "\n"
+  """MimeType=application/flatimage_{name};""" "\n"
+  """Categories=Network;System;"""
+)
 
 class DesktopTestBase(TestBase):
   """
@@ -15,78 +73,55 @@ class DesktopTestBase(TestBase):
 
   def setUp(self):
     super().setUp()
+    # Environment of the commands, with XDG_DATA_HOME pointed at the directory
+    # re-created for each test instead of the one of the user
+    self.env = {**os.environ, "XDG_DATA_HOME": str(self.dir_xdg)}
 
   def tearDown(self):
     super().tearDown()
 
+  def check_setup_output(self, out, name, *integrations):
+    """Verify the JSON printed by 'fim-desktop setup', integrations in the order they are printed"""
+    self.assertEqual(json_loads(out), {
+      "categories": ["Network", "System"],
+      "integrations": list(integrations),
+      "name": name,
+    })
+
   def make_json_setup(self, integrations, name, ext_icon='png'):
     """Create a desktop integration JSON configuration file"""
-    with open(self.file_desktop, "w") as file:
-      file.write(
-      """{""" "\n"
-      rf"""  "integrations": [{integrations}],""" "\n"
-      rf"""  "name": "{name}",""" "\n"
-      rf"""  "icon": "{self.dir_data}/icon.{ext_icon}",""" "\n"
-      """  "categories": ["System", "Network"]""" "\n"
-      """}""" "\n"
-    )
+    data = DESKTOP_JSON_TEMPLATE % (integrations.encode(), name.encode(), os.fsencode(self.dir_data), ext_icon.encode())
+    fd = os.open(self.file_desktop, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+      os.write(fd, data)
+    finally:
+      os.close(fd)
 
   def check_mime_generic(self, name, path_dir_xdg, fun):
     """Verify the generic FlatImage MIME type registration file"""
     path_file_mime_generic = path_dir_xdg / "mime" / "packages" / "flatimage.xml"
     fun(path_file_mime_generic.exists())
     if path_file_mime_generic.exists():
-      expected = (
-        """<?xml version="1.0" encoding="UTF-8"?>""" "\n"
-        """<mime-info xmlns="http://www.freedesktop.org/standards/shared-mime-info">""" "\n"
-        """  <mime-type type="application/flatimage">""" "\n"
-        """    <comment>FlatImage Application</comment>""" "\n"
-        """    <magic>""" "\n"
-        """      <match value="ELF" type="string" offset="1">""" "\n"
-        """        <match value="0x46" type="byte" offset="8">""" "\n"
-        """          <match value="0x49" type="byte" offset="9">""" "\n"
-        """            <match value="0x01" type="byte" offset="10"/>""" "\n"
-        """          </match>""" "\n"
-        """        </match>""" "\n"
-        """      </match>""" "\n"
-        """    </magic>""" "\n"
-        rf"""    <glob weight="50" pattern="*.flatimage"/>""" "\n"
-        """    <sub-class-of type="application/x-executable"/>""" "\n"
-        """    <generic-icon name="application-flatimage"/>""" "\n"
-        """  </mime-type>""" "\n"
-        """</mime-info>""" "\n"
-      )
-      with open(path_file_mime_generic, 'r') as file:
-        contents = file.read()
-        self.assertEqual(expected, contents)
+      self.assertEqual(MIME_GENERIC, path_file_mime_generic.read_bytes())
 
   def check_mime(self, name, path_dir_xdg, fun):
     """Verify the application-specific MIME type registration file"""
     path_file_mime = path_dir_xdg / "mime" / "packages" / f"flatimage-{name}.xml"
     fun(path_file_mime.exists())
     if path_file_mime.exists():
-      expected = (
-        r"""<?xml version="1.0" encoding="UTF-8"?>""" "\n"
-        r"""<mime-info xmlns="http://www.freedesktop.org/standards/shared-mime-info">""" "\n"
-        rf"""  <mime-type type="application/flatimage_{name}">""" "\n"
-        r"""    <comment>FlatImage Application</comment>""" "\n"
-        rf"""    <glob weight="100" pattern="{Path(self.file_image).name}"/>""" "\n"
-        r"""    <sub-class-of type="application/x-executable"/>""" "\n"
-        r"""    <generic-icon name="application-flatimage"/>""" "\n"
-        r"""  </mime-type>""" "\n"
-        r"""</mime-info>"""
-      )
-      with open(path_file_mime, 'r') as file:
-        contents = file.read()
-        self.assertEqual(expected, contents)
+      expected = MIME_TEMPLATE.format(name=name, pattern=self.name_image).encode()
+      self.assertEqual(expected, path_file_mime.read_bytes())
 
   def check_icons(self, name, path_dir_xdg, ext, fun):
     """Verify icon files are installed in appropriate directories"""
+    # Collect the size directories that hold the icon in one pass, instead of a stat per size
+    sizes = {path.parent.parent.name
+      for path in (path_dir_xdg / "icons" / "hicolor").glob(f"*/apps/flatimage_{name}.{ext}")}
     if ext == 'png':
-      for i in [16,22,24,32,48,64,96,128,256]:
-        fun((path_dir_xdg / "icons" / "hicolor" / f"{i}x{i}" / "apps" / f"flatimage_{name}.png").exists())
+      for i in ICON_SIZES:
+        fun(f"{i}x{i}" in sizes)
     else:
-      fun((path_dir_xdg / "icons" / "hicolor" / "scalable" / "apps" / f"flatimage_{name}.svg").exists())
+      fun("scalable" in sizes)
 
   def check_entry(self, image, name, path_dir_xdg, fun):
     """Verify the desktop entry file exists and has correct content"""
@@ -95,32 +130,27 @@ class DesktopTestBase(TestBase):
     fun(path_dir_entry.exists())
     # If it does exist, also check the file contents
     if path_dir_entry.exists():
-      expected: str = (
-        """[Desktop Entry]""" "\n"
-        rf"""Name={name}""" "\n"
-        """Type=Application""" "\n"
-        rf'''Comment=FlatImage distribution of "{name}"''' "\n"
-        rf"""Exec="{image}" %F""" "\n"
-        rf"""Icon=flatimage_{name}""" "\n"
-        rf"""MimeType=application/flatimage_{name};""" "\n"
-        """Categories=Network;System;"""
-      )
-      with open(path_dir_entry, "r") as file:
-        contents = file.read()
-        self.assertEqual(expected, contents)
+      expected = ENTRY_TEMPLATE.format(name=name, image=image).encode()
+      self.assertEqual(expected, path_dir_entry.read_bytes())
 
   def setup_xdg_data_home(self):
-    """Set up temporary XDG_DATA_HOME directory for testing"""
+    """Empty the temporary XDG_DATA_HOME directory of self.env for testing"""
     path_dir_xdg = self.dir_xdg
-    shutil.rmtree(path_dir_xdg, ignore_errors=True)
+    # setUp leaves the directory empty, only re-create it once a command wrote to it
+    try:
+      with os.scandir(path_dir_xdg) as entries:
+        if not any(entries):
+          return path_dir_xdg
+    except FileNotFoundError:
+      pass
+    fast_rmtree(path_dir_xdg)
     path_dir_xdg.mkdir(parents=True, exist_ok=False)
-    os.environ["XDG_DATA_HOME"] = str(path_dir_xdg)
     return path_dir_xdg
 
   def check_enabled_options(self, name, fchk1, fchk2, fchk3):
     """Verify which desktop integration options are enabled"""
     path_dir_xdg = self.setup_xdg_data_home()
-    out, err, code = run_cmd(self.file_image, "fim-exec", "echo")
+    out, err, code = run_cmd(self.file_image, "fim-exec", "echo", env=self.env)
     self.assertEqual(out, "")
     self.assertEqual(err, "")
     self.assertEqual(code, 0)
@@ -128,5 +158,3 @@ class DesktopTestBase(TestBase):
     self.check_mime_generic(name, path_dir_xdg, fchk1)
     self.check_icons(name, path_dir_xdg, "png", fchk2)
     self.check_entry(self.file_image, name, path_dir_xdg, fchk3)
-    shutil.rmtree(path_dir_xdg, ignore_errors=True)
-    path_dir_xdg.mkdir(parents=True, exist_ok=False)
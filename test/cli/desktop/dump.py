@@ -2,11 +2,15 @@
 
 import unittest
 import os
-import subprocess
-from pathlib import Path
-from .common import DesktopTestBase
+import hashlib
+from .common import DesktopTestBase, MIME_TEMPLATE, ENTRY_TEMPLATE
 from cli.test_runner import run_cmd
 
+def _sha256(path):
+  """SHA-256 hex digest of a file, computed in-process"""
+  with open(path, "rb") as file:
+    return hashlib.file_digest(file, "sha256").hexdigest()
+
 class TestFimDesktopDump(DesktopTestBase):
   """
   Test suite for fim-desktop dump command:
@@ -23,15 +27,15 @@ class TestFimDesktopDump(DesktopTestBase):
   def test_dump_nosetup(self):
     """Test dump command when desktop integration is not set up"""
     self.setup_xdg_data_home()
-    out, err, code = run_cmd(self.file_image, "fim-desktop", "dump", "entry")
+    out, err, code = run_cmd(self.file_image, "fim-desktop", "dump", "entry", env=self.env)
     self.assertEqual(out, "")
     self.assertIn("Empty json data", err)
     self.assertEqual(code, 125)
-    out, err, code = run_cmd(self.file_image, "fim-desktop", "dump", "mimetype")
+    out, err, code = run_cmd(self.file_image, "fim-desktop", "dump", "mimetype", env=self.env)
     self.assertEqual(out, "")
     self.assertIn("Empty json data", err)
     self.assertEqual(code, 125)
-    out, err, code = run_cmd(self.file_image, "fim-desktop", "dump", "icon", self.dir_data / "out.png")
+    out, err, code = run_cmd(self.file_image, "fim-desktop", "dump", "icon", self.dir_data / "out.png", env=self.env)
     self.assertEqual(out, "")
     self.assertIn("Empty icon data", err)
     self.assertEqual(code, 125)
@@ -42,47 +46,32 @@ class TestFimDesktopDump(DesktopTestBase):
       name = "MyApp"
       # Setup desktop integration
       self.make_json_setup(r'''"ICON"''', name, ext_icon)
-      run_cmd(self.file_image, "fim-desktop", "setup", str(self.file_desktop))
+      run_cmd(self.file_image, "fim-desktop", "setup", str(self.file_desktop), env=self.env)
       # Dump icon
       self.setup_xdg_data_home()
       file_icon = self.dir_data / f"out.{ext_icon}"
-      out, err, code = run_cmd(self.file_image, "fim-desktop", "dump", "icon", str(file_icon))
+      out, err, code = run_cmd(self.file_image, "fim-desktop", "dump", "icon", str(file_icon), env=self.env)
       self.assertEqual(out, "")
       self.assertEqual(err, "")
       self.assertEqual(code, 0)
       self.assertTrue(file_icon.exists())
       # Compare icon SHA with source
-      sha_base = subprocess.run(
-        ["sha256sum", str(self.dir_data / f"icon.{ext_icon}")],
-        stdout=subprocess.PIPE,
-        stderr=subprocess.PIPE,
-        text=True
-      )
-      sha_target = subprocess.run(
-        ["sha256sum", str(file_icon)],
-        stdout=subprocess.PIPE,
-        stderr=subprocess.PIPE,
-        text=True
-      )
-      self.assertEqual(sha_base.stdout[:64], sha_target.stdout[:64])
+      sha_base = _sha256(self.dir_data / f"icon.{ext_icon}")
+      sha_target = _sha256(file_icon)
+      self.assertEqual(sha_base, sha_target)
       # Generate extension
       os.remove(file_icon)
-      out, err, code = run_cmd(self.file_image, "fim-desktop", "dump", "icon", str(self.dir_data / "out"))
+      out, err, code = run_cmd(self.file_image, "fim-desktop", "dump", "icon", str(self.dir_data / "out"), env=self.env)
       self.assertEqual(out, "")
       self.assertEqual(err, "")
       self.assertEqual(code, 0)
-      sha_target = subprocess.run(
-        ["sha256sum", file_icon],
-        stdout=subprocess.PIPE,
-        stderr=subprocess.PIPE,
-        text=True
-      )
-      self.assertEqual(sha_base.stdout[:64], sha_target.stdout[:64])
+      sha_target = _sha256(file_icon)
+      self.assertEqual(sha_base, sha_target)
       # Test clean
-      out, err, code = run_cmd(self.file_image, "fim-desktop", "clean")
+      out, err, code = run_cmd(self.file_image, "fim-desktop", "clean", env=self.env)
       self.assertIn("Removed file", out)
       self.assertEqual(code, 0)
-      out, err, code = run_cmd(self.file_image, "fim-desktop", "dump", "icon", file_icon)
+      out, err, code = run_cmd(self.file_image, "fim-desktop", "dump", "icon", file_icon, env=self.env)
       self.assertEqual(out, "")
       self.assertEqual(err, "")
       self.assertEqual(code, 0)
@@ -96,28 +85,19 @@ class TestFimDesktopDump(DesktopTestBase):
     self.setup_xdg_data_home()
     # Setup desktop integration
     self.make_json_setup(r'''"ENTRY"''', name)
-    run_cmd(self.file_image, "fim-desktop", "setup", str(self.file_desktop))
+    run_cmd(self.file_image, "fim-desktop", "setup", str(self.file_desktop), env=self.env)
     # Dump desktop entry
-    out, err, code = run_cmd(self.file_image, "fim-desktop", "dump", "entry")
+    out, err, code = run_cmd(self.file_image, "fim-desktop", "dump", "entry", env=self.env)
     self.assertEqual(err, "")
     self.assertEqual(code, 0)
     # Check if entry matches expected output
-    expected: str = (
-      """[Desktop Entry]""" "\n"
-      rf"""Name={name}""" "\n"
-      """Type=Application""" "\n"
-      rf'''Comment=FlatImage distribution of "{name}"''' "\n"
-      rf"""Exec="{self.file_image}" %F""" "\n"
-      rf"""Icon=flatimage_{name}""" "\n"
-      rf"""MimeType=application/flatimage_{name};""" "\n"
-      """Categories=Network;System;"""
-    )
+    expected = ENTRY_TEMPLATE.format(name=name, image=self.file_image)
     self.assertEqual(expected, out)
     # Test clean
-    out, err, code = run_cmd(self.file_image, "fim-desktop", "clean")
+    out, err, code = run_cmd(self.file_image, "fim-desktop", "clean", env=self.env)
     self.assertIn("Removed file", out)
     self.assertEqual(code, 0)
-    out, err, code = run_cmd(self.file_image, "fim-desktop", "dump", "entry")
+    out, err, code = run_cmd(self.file_image, "fim-desktop", "dump", "entry", env=self.env)
     self.assertEqual(out, expected)
     self.assertEqual(err, "")
     self.assertEqual(code, 0)
@@ -128,30 +108,20 @@ class TestFimDesktopDump(DesktopTestBase):
     name = "MyApp"
     # Setup desktop integration
     self.make_json_setup(r'''"MIMETYPE"''', name)
-    run_cmd(self.file_image, "fim-desktop", "setup", str(self.file_desktop))
+    run_cmd(self.file_image, "fim-desktop", "setup", str(self.file_desktop), env=self.env)
     # Dump mime type
     self.setup_xdg_data_home()
-    out, err, code = run_cmd(self.file_image, "fim-desktop", "dump", "mimetype")
+    out, err, code = run_cmd(self.file_image, "fim-desktop", "dump", "mimetype", env=self.env)
     self.assertEqual(err, "")
     self.assertEqual(code, 0)
     # Check if mime type matches expected output
-    expected = (
-      r"""<?xml version="1.0" encoding="UTF-8"?>""" "\n"
-      r"""<mime-info xmlns="http://www.freedesktop.org/standards/shared-mime-info">""" "\n"
-      rf"""  <mime-type type="application/flatimage_{name}">""" "\n"
-      r"""    <comment>FlatImage Application</comment>""" "\n"
-      rf"""    <glob weight="100" pattern="{Path(self.file_image).name}"/>""" "\n"
-      r"""    <sub-class-of type="application/x-executable"/>""" "\n"
-      r"""    <generic-icon name="application-flatimage"/>""" "\n"
-      r"""  </mime-type>""" "\n"
-      r"""</mime-info>"""
-    )
+    expected = MIME_TEMPLATE.format(name=name, pattern=self.name_image)
     self.assertEqual(expected, out)
     # Test clean
-    out, err, code = run_cmd(self.file_image, "fim-desktop", "clean")
+    out, err, code = run_cmd(self.file_image, "fim-desktop", "clean", env=self.env)
     self.assertIn("Removed file", out)
     self.assertEqual(code, 0)
-    out, err, code = run_cmd(self.file_image, "fim-desktop", "dump", "mimetype")
+    out, err, code = run_cmd(self.file_image, "fim-desktop", "dump", "mimetype", env=self.env)
     self.assertEqual(out, expected)
     self.assertEqual(err, "")
     self.assertEqual(code, 0)
@@ -2,6 +2,8 @@
 
 import unittest
 from .common import DesktopTestBase, run_cmd
+from cli.test_runner import copy_image
+from cli.test_base import keeps_image
 
 class TestFimDesktopEnable(DesktopTestBase):
   """
@@ -20,47 +22,38 @@ class TestFimDesktopEnable(DesktopTestBase):
     # Setup integration
     name = "MyApp"
     self.make_json_setup("", name)
-    out, err, code = run_cmd(self.file_image, "fim-desktop", "setup", str(self.file_desktop))
-    self.assertEqual(out,
-      """{\n"""
-      """  "categories": [\n"""
-      """    "Network",\n"""
-      """    "System"\n"""
-      """  ],\n"""
-      """  "integrations": [],\n"""
-      """  "name": "MyApp"\n"""
-      """}"""
-    )
+    out, err, code = run_cmd(self.file_image, "fim-desktop", "setup", str(self.file_desktop), env=self.env)
+    self.check_setup_output(out, name)
     self.assertEqual(err, "")
     self.assertEqual(code, 0)
     # Nothing enabled
     self.check_enabled_options(name, self.assertFalse, self.assertFalse, self.assertFalse)
     # Mimetype
-    out, err, code = run_cmd(self.file_image, "fim-desktop", "enable", "mimetype")
+    out, err, code = run_cmd(self.file_image, "fim-desktop", "enable", "mimetype", env=self.env)
     self.assertEqual(out, "MIMETYPE")
     self.assertEqual(err, "")
     self.assertEqual(code, 0)
     self.check_enabled_options(name, self.assertTrue, self.assertFalse, self.assertFalse)
     # Icon
-    out, err, code = run_cmd(self.file_image, "fim-desktop", "enable", "icon")
+    out, err, code = run_cmd(self.file_image, "fim-desktop", "enable", "icon", env=self.env)
     self.assertEqual(out, "ICON")
     self.assertEqual(err, "")
     self.assertEqual(code, 0)
     self.check_enabled_options(name, self.assertFalse, self.assertTrue, self.assertFalse)
     # Desktop entry
-    out, err, code = run_cmd(self.file_image, "fim-desktop", "enable", "entry")
+    out, err, code = run_cmd(self.file_image, "fim-desktop", "enable", "entry", env=self.env)
     self.assertEqual(out, "ENTRY")
     self.assertEqual(err, "")
     self.assertEqual(code, 0)
     self.check_enabled_options(name, self.assertFalse, self.assertFalse, self.assertTrue)
     # All
-    out, err, code = run_cmd(self.file_image, "fim-desktop", "enable", "entry,mimetype,icon")
+    out, err, code = run_cmd(self.file_image, "fim-desktop", "enable", "entry,mimetype,icon", env=self.env)
     self.assertEqual(out, "ENTRY\nMIMETYPE\nICON")
     self.assertEqual(err, "")
     self.assertEqual(code, 0)
     self.check_enabled_options(name, self.assertTrue, self.assertTrue, self.assertTrue)
     # None
-    out, err, code = run_cmd(self.file_image, "fim-desktop", "enable", "none")
+    out, err, code = run_cmd(self.file_image, "fim-desktop", "enable", "none", env=self.env)
     self.assertEqual(out, "NONE")
     self.assertEqual(err, "")
     self.assertEqual(code, 0)
@@ -69,106 +62,48 @@ class TestFimDesktopEnable(DesktopTestBase):
   def test_enable_json(self):
     """Test enabling desktop integration options via JSON configuration"""
     name = "MyApp"
-    # Mimetype
-    self.make_json_setup('''"MIMETYPE"''', name)
-    out, err, code = run_cmd(self.file_image, "fim-desktop", "setup", str(self.file_desktop))
-    self.assertEqual(out,
-      """{\n"""
-      """  "categories": [\n"""
-      """    "Network",\n"""
-      """    "System"\n"""
-      """  ],\n"""
-      """  "integrations": [\n"""
-      """    "MIMETYPE"\n"""
-      """  ],\n"""
-      """  "name": "MyApp"\n"""
-      """}"""
-    )
-    self.assertEqual(err, "")
-    self.assertEqual(code, 0)
-    self.check_enabled_options(name, self.assertTrue, self.assertFalse, self.assertFalse)
-    # Icons
-    self.make_json_setup('''"ICON"''', name)
-    out, err, code = run_cmd(self.file_image, "fim-desktop", "setup", str(self.file_desktop))
-    self.assertEqual(out,
-      """{\n"""
-      """  "categories": [\n"""
-      """    "Network",\n"""
-      """    "System"\n"""
-      """  ],\n"""
-      """  "integrations": [\n"""
-      """    "ICON"\n"""
-      """  ],\n"""
-      """  "name": "MyApp"\n"""
-      """}"""
-    )
-    self.assertEqual(err, "")
-    self.assertEqual(code, 0)
-    self.check_enabled_options(name, self.assertFalse, self.assertTrue, self.assertFalse)
-    # Desktop entry
-    self.make_json_setup('''"ENTRY"''', name)
-    out, err, code = run_cmd(self.file_image, "fim-desktop", "setup", str(self.file_desktop))
-    self.assertEqual(out,
-      """{\n"""
-      """  "categories": [\n"""
-      """    "Network",\n"""
-      """    "System"\n"""
-      """  ],\n"""
-      """  "integrations": [\n"""
-      """    "ENTRY"\n"""
-      """  ],\n"""
-      """  "name": "MyApp"\n"""
-      """}"""
+    # Integrations of the configuration, and whether mimetype, icon and entry end up enabled
+    cases = (
+      (("MIMETYPE",), (True, False, False)),
+      (("ICON",), (False, True, False)),
+      (("ENTRY",), (False, False, True)),
+      (("ENTRY", "MIMETYPE", "ICON"), (True, True, True)),
     )
-    self.assertEqual(err, "")
-    self.assertEqual(code, 0)
-    self.check_enabled_options(name, self.assertFalse, self.assertFalse, self.assertTrue)
-    # All
-    self.make_json_setup('''"ENTRY","MIMETYPE","ICON"''', name)
-    out, err, code = run_cmd(self.file_image, "fim-desktop", "setup", str(self.file_desktop))
-    self.assertEqual(out,
-      """{\n"""
-      """  "categories": [\n"""
-      """    "Network",\n"""
-      """    "System"\n"""
-      """  ],\n"""
-      """  "integrations": [\n"""
-      """    "ENTRY",\n"""
-      """    "MIMETYPE",\n"""
-      """    "ICON"\n"""
-      """  ],\n"""
-      """  "name": "MyApp"\n"""
-      """}"""
-    )
-    self.assertEqual(err, "")
-    self.assertEqual(code, 0)
-    self.check_enabled_options(name, self.assertTrue, self.assertTrue, self.assertTrue)
+    for integrations, enabled in cases:
+      with self.subTest(integrations=integrations):
+        self.make_json_setup(",".join(f'"{item}"' for item in integrations), name)
+        out, err, code = run_cmd(self.file_image, "fim-desktop", "setup", str(self.file_desktop), env=self.env)
+        self.check_setup_output(out, name, *integrations)
+        self.assertEqual(err, "")
+        self.assertEqual(code, 0)
+        self.check_enabled_options(name, *(self.assertTrue if flag else self.assertFalse for flag in enabled))
     # Invalid
     self.make_json_setup('''"ICONN"''', name)
-    out, err, code = run_cmd(self.file_image, "fim-desktop", "setup", str(self.file_desktop))
+    out, err, code = run_cmd(self.file_image, "fim-desktop", "setup", str(self.file_desktop), env=self.env)
     self.assertEqual(out, "")
     self.assertIn("Failed to deserialize json", err)
     self.assertEqual(code, 125)
 
+  @keeps_image
   def test_enable_cli(self):
     """Test enable command CLI argument validation"""
     # Missing arguments
-    out, err, code = run_cmd(self.file_image, "fim-desktop", "enable")
+    out, err, code = run_cmd(self.file_image, "fim-desktop", "enable", env=self.env)
     self.assertEqual(out, "")
     self.assertIn("Missing arguments for 'enable' (entry,mimetype,icon,none)", err)
     self.assertEqual(code, 125)
     # Extra arguments
-    out, err, code = run_cmd(self.file_image, "fim-desktop", "enable", "icon", "mimetype")
+    out, err, code = run_cmd(self.file_image, "fim-desktop", "enable", "icon", "mimetype", env=self.env)
     self.assertEqual(out, "")
     self.assertIn("Trailing arguments for fim-desktop: ['mimetype',]", err)
     self.assertEqual(code, 125)
     # none + others
-    out, err, code = run_cmd(self.file_image, "fim-desktop", "enable", "none,mimetype")
+    out, err, code = run_cmd(self.file_image, "fim-desktop", "enable", "none,mimetype", env=self.env)
     self.assertEqual(out, "")
     self.assertIn("'none' option should not be used with others", err)
     self.assertEqual(code, 125)
     # Invalid arguments
-    out, err, code = run_cmd(self.file_image, "fim-desktop", "enable", "icon2")
+    out, err, code = run_cmd(self.file_image, "fim-desktop", "enable", "icon2", env=self.env)
     self.assertEqual(out, "")
     self.assertIn("Invalid integration item", err)
     self.assertEqual(code, 125)
@@ -179,59 +114,41 @@ class TestFimDesktopEnable(DesktopTestBase):
 
   def test_path_change(self):
     """Test that desktop integration updates when binary path changes"""
-    import os
-    import shutil
-    from pathlib import Path
-    
     name = "MyApp"
     path_dir_xdg = self.setup_xdg_data_home()
     # Setup integration
     self.make_json_setup(r'''"ENTRY","MIMETYPE","ICON"''', name)
-    os.environ["FIM_DEBUG"] = "1"
-    out, err, code = run_cmd(self.file_image, "fim-desktop", "setup", str(self.file_desktop))
-    self.assertIn("""{\n"""
-      """  "categories": [\n"""
-      """    "Network",\n"""
-      """    "System"\n"""
-      """  ],\n"""
-      """  "integrations": [\n"""
-      """    "ENTRY",\n"""
-      """    "MIMETYPE",\n"""
-      """    "ICON"\n"""
-      """  ],\n"""
-      """  "name": "MyApp"\n"""
-      """}"""
-      , out
-    )
+    out, err, code = run_cmd(self.file_image, "fim-desktop", "setup", str(self.file_desktop), env=self.env)
+    self.check_setup_output(out, name, "ENTRY", "MIMETYPE", "ICON")
     self.assertEqual(err, "")
     self.assertEqual(code, 0)
+    # The mime database messages are debug logs
+    env = {**self.env, "FIM_DEBUG": "1"}
     # First run integrates mime database
-    out, err, code = run_cmd(self.file_image, "fim-exec", "echo")
+    out, err, code = run_cmd(self.file_image, "fim-exec", "echo", env=env)
     self.assertIn("Updating mime database", out)
     self.assertNotIn("Updating mime database", err)
     self.assertEqual(code, 0)
     # Second run detects it is already integrated
-    out, err, code = run_cmd(self.file_image, "fim-exec", "echo")
+    out, err, code = run_cmd(self.file_image, "fim-exec", "echo", env=env)
     self.assertIn("Skipping mime database update", out)
     self.assertNotIn("Skipping mime database update", err)
     self.assertEqual(code, 0)
     # Check if entry has correct binary path
     self.check_entry(self.file_image, name, path_dir_xdg, self.assertTrue)
     # Copy file to another path
-    file_image = Path(self.file_image).parent / "temp.flatimage"
-    shutil.copyfile(self.file_image, file_image)
-    os.chmod(file_image, 0o755)
+    file_image = self.file_image_temp
+    copy_image(self.file_image, file_image)
     # Run again
-    out, err, code = run_cmd(str(file_image), "fim-exec", "echo")
+    out, err, code = run_cmd(str(file_image), "fim-exec", "echo", env=env)
     self.assertIn("Updating mime database", out)
     self.assertNotIn("Updating mime database", err)
     self.assertEqual(code, 0)
     self.check_entry(file_image, name, path_dir_xdg, self.assertTrue)
-    out, err, code = run_cmd(str(file_image), "fim-exec", "echo")
+    out, err, code = run_cmd(str(file_image), "fim-exec", "echo", env=env)
     self.assertIn("Skipping mime database update", out)
     self.assertNotIn("Skipping mime database update", err)
     self.assertEqual(code, 0)
-    os.environ["FIM_DEBUG"] = "0"
 
   # ===========================================================================
   # Edge Cases and Error Handling
@@ -243,24 +160,11 @@ class TestFimDesktopEnable(DesktopTestBase):
     _ = self.setup_xdg_data_home()
     # Setup integration
     self.make_json_setup(r'''"ENTRY","MIMETYPE","ICON"''', name)
-    out, err, code = run_cmd(self.file_image, "fim-desktop", "setup", str(self.file_desktop))
-    self.assertEqual(out,
-      """{\n"""
-      """  "categories": [\n"""
-      """    "Network",\n"""
-      """    "System"\n"""
-      """  ],\n"""
-      """  "integrations": [\n"""
-      """    "ENTRY",\n"""
-      """    "MIMETYPE",\n"""
-      """    "ICON"\n"""
-      """  ],\n"""
-      """  "name": "My App"\n"""
-      """}"""
-    )
+    out, err, code = run_cmd(self.file_image, "fim-desktop", "setup", str(self.file_desktop), env=self.env)
+    self.check_setup_output(out, name, "ENTRY", "MIMETYPE", "ICON")
     self.assertEqual(err, "")
     self.assertEqual(code, 0)
-    out, err, code = run_cmd(self.file_image, "fim-exec", "echo")
+    out, err, code = run_cmd(self.file_image, "fim-exec", "echo", env=self.env)
     # Check for the correct files paths
     self.check_enabled_options(name, self.assertTrue, self.assertTrue, self.assertTrue)
 
@@ -270,7 +174,7 @@ class TestFimDesktopEnable(DesktopTestBase):
     _ = self.setup_xdg_data_home()
     # Setup integration
     self.make_json_setup(r'''"ENTRY","MIMETYPE","ICON"''', name)
-    out, err, code = run_cmd(self.file_image, "fim-desktop", "setup", str(self.file_desktop))
+    out, err, code = run_cmd(self.file_image, "fim-desktop", "setup", str(self.file_desktop), env=self.env)
     self.assertEqual(out, "")
     self.assertIn("Application name cannot contain the '/' character", err)
     self.assertEqual(code, 125)
@@ -4,6 +4,7 @@ import unittest
 import json
 from cli.test_runner import run_cmd
 from .common import DesktopTestBase
+from cli.test_base import keeps_image
 
 class TestFimDesktopSetup(DesktopTestBase):
   """
@@ -21,7 +22,7 @@ class TestFimDesktopSetup(DesktopTestBase):
     """Test setup command with valid and invalid configurations"""
     name = "MyApp"
     self.make_json_setup(r'''"ICON","MIMETYPE","ENTRY"''', name)
-    out, err, code = run_cmd(self.file_image, "fim-desktop", "setup", str(self.file_desktop))
+    out, err, code = run_cmd(self.file_image, "fim-desktop", "setup", str(self.file_desktop), env=self.env)
     self.assertEqual(err, "")
     self.assertEqual(code, 0)
     desktop = json.loads(out)
@@ -35,25 +36,26 @@ class TestFimDesktopSetup(DesktopTestBase):
       desktop["icon"] = "/some/path/to/missing/icon.png"
     with open(self.file_desktop, "w") as file:
       json.dump(desktop, file)
-    out, err, code = run_cmd(self.file_image, "fim-desktop", "setup", str(self.file_desktop))
+    out, err, code = run_cmd(self.file_image, "fim-desktop", "setup", str(self.file_desktop), env=self.env)
     self.assertEqual(out, "")
     self.assertIn("Could not get size of file '/some/path/to/missing/icon.png': No such file or directory", err)
     self.assertEqual(code, 125)
 
+  @keeps_image
   def test_setup_cli(self):
     """Test setup command CLI argument validation"""
     # Missing argument
-    out, err, code = run_cmd(self.file_image, "fim-desktop", "setup")
+    out, err, code = run_cmd(self.file_image, "fim-desktop", "setup", env=self.env)
     self.assertEqual(out, "")
     self.assertIn("Missing argument for 'setup' (/path/to/file.json)", err)
     self.assertEqual(code, 125)
     # Extra argument
-    out, err, code = run_cmd(self.file_image, "fim-desktop", "setup", "some-file.json", "hello")
+    out, err, code = run_cmd(self.file_image, "fim-desktop", "setup", "some-file.json", "hello", env=self.env)
     self.assertEqual(out, "")
     self.assertIn("Trailing arguments for fim-desktop: ['hello',]", err)
     self.assertEqual(code, 125)
     # Missing json file
-    out, err, code = run_cmd(self.file_image, "fim-desktop", "setup", "some-file.json")
+    out, err, code = run_cmd(self.file_image, "fim-desktop", "setup", "some-file.json", env=self.env)
     self.assertEqual(out, "")
     self.assertIn("Failed to open file 'some-file.json' for desktop integration", err)
     self.assertEqual(code, 125)
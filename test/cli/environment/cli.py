@@ -4,6 +4,7 @@ Test suite for fim-env CLI validation and variable format validation.
 """
 
 from .common import EnvTestBase
+from cli.test_base import keeps_image
 from cli.test_runner import run_cmd
 
 class TestFimEnvCli(EnvTestBase):
@@ -13,6 +14,7 @@ class TestFimEnvCli(EnvTestBase):
 
   # === CLI Validation Tests ===
 
+  @keeps_image
   def test_variable_invalid(self):
     """Test invalid variable formats."""
     # Invalid variable
@@ -27,6 +29,7 @@ class TestFimEnvCli(EnvTestBase):
     self.assertIn("Variable assignment 'IMADETHIS' is invalid", err)
     self.assertEqual(code, 125)
 
+  @keeps_image
   def test_option_empty(self):
     """Test missing operation."""
     # Empty variable
@@ -35,6 +38,7 @@ class TestFimEnvCli(EnvTestBase):
     self.assertIn("Missing op for 'fim-env' (add,del,list,set,clear)", err)
     self.assertEqual(code, 125)
 
+  @keeps_image
   def test_option_invalid(self):
     """Test invalid operation."""
     # Invalid variable
@@ -10,9 +10,3 @@ class EnvTestBase(TestBase):
   """
   Base class for environment tests. Provides common setup/teardown and utilities for testing fim-env.
   """
-
-  def setUp(self):
-    super().setUp()
-
-  def tearDown(self):
-    super().tearDown()
\ No newline at end of file
@@ -27,11 +27,6 @@ class TestFimEnvDel(EnvTestBase):
     self.assertIn("Included variable 'TEST' with value 'ME'", out)
     self.assertEqual(err, "")
     self.assertEqual(code, 0)
-    out,err,code = run_cmd(self.file_image, "fim-env", "list")
-    self.assertEqual(err, "")
-    self.assertEqual(code, 0)
-    lines = out.splitlines()
-    self.assertEqual(len(lines), 3)
     # Deleted 2 variables
     out,err,code = run_cmd(self.file_image, "fim-env", "del", "IMADE", "NO")
     self.assertIn("Erase key 'IMADE'", out)
@@ -39,11 +34,9 @@ class TestFimEnvDel(EnvTestBase):
     self.assertEqual(err, "")
     self.assertEqual(code, 0)
     out,err,code = run_cmd(self.file_image, "fim-env", "list")
+    self.assertEqual(out.splitlines(), ["TEST=ME"])
     self.assertEqual(err, "")
     self.assertEqual(code, 0)
-    lines = out.splitlines()
-    self.assertEqual(len(lines), 1)
-    self.assertEqual(lines[0], "TEST=ME")
     # Deleted all variables
     out,err,code = run_cmd(self.file_image, "fim-env", "del", "TEST")
     self.assertIn("Erase key 'TEST'", out)
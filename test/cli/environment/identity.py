@@ -7,7 +7,7 @@ import os
 import getpass
 import pwd
 from .common import EnvTestBase
-from cli.test_runner import run_cmd
+from cli.test_runner import run_cmd, run_batch
 
 class TestFimEnvIdentity(EnvTestBase):
   """
@@ -24,18 +24,19 @@ class TestFimEnvIdentity(EnvTestBase):
     self.assertIn("Included variable 'GID' with value '5000'", out)
     self.assertEqual(err, "")
     self.assertEqual(code, 0)
+    uid, gid, ids = run_batch(self.file_image, ["id", "-u"], ["id", "-g"], ["id"])
     # Verify UID in container
-    out,err,code = run_cmd(self.file_image, "fim-exec", "id", "-u")
+    out,err,code = uid
     self.assertEqual(out, "5000")
     self.assertEqual(err, "")
     self.assertEqual(code, 0)
     # Verify GID in container
-    out,err,code = run_cmd(self.file_image, "fim-exec", "id", "-g")
+    out,err,code = gid
     self.assertEqual(out, "5000")
     self.assertEqual(err, "")
     self.assertEqual(code, 0)
     # Verify full id output
-    out,err,code = run_cmd(self.file_image, "fim-exec", "id")
+    out,err,code = ids
     self.assertIn("uid=5000", out)
     self.assertIn("gid=5000", out)
     self.assertEqual(err, "")
@@ -120,26 +121,38 @@ class TestFimEnvIdentity(EnvTestBase):
     self.assertIn("Included variable 'SHELL' with value '/bin/sh'", out)
     self.assertEqual(err, "")
     self.assertEqual(code, 0)
+    uid, gid, user, home, passwd = run_batch(self.file_image,
+      ["id", "-u"],
+      ["id", "-g"],
+      ["whoami"],
+      ["sh", "-c", "echo $HOME"],
+      ["cat", "/etc/passwd"])
     # Verify UID
-    out,err,code = run_cmd(self.file_image, "fim-exec", "id", "-u")
+    out,err,code = uid
     self.assertEqual(out, "5000")
     self.assertEqual(code, 0)
     # Verify GID
-    out,err,code = run_cmd(self.file_image, "fim-exec", "id", "-g")
+    out,err,code = gid
     self.assertEqual(out, "5000")
     self.assertEqual(code, 0)
     # Verify username
-    out,err,code = run_cmd(self.file_image, "fim-exec", "whoami")
+    out,err,code = user
     self.assertEqual(out, "webapp")
     self.assertEqual(code, 0)
     # Verify HOME
-    out,err,code = run_cmd(self.file_image, "fim-exec", "sh", "-c", "echo $HOME")
+    out,err,code = home
     self.assertEqual(out, "/app")
     self.assertEqual(code, 0)
     # Verify complete passwd entry
-    out,err,code = run_cmd(self.file_image, "fim-exec", "cat", "/etc/passwd")
+    out,err,code = passwd
     self.assertIn("webapp:x:5000:5000:webapp:/app:/bin/sh", out)
     self.assertEqual(code, 0)
+    # Verify the identity is also set on a new boot
+    out,err,code = run_cmd(self.file_image, "fim-exec", "id")
+    self.assertIn("uid=5000(webapp)", out)
+    self.assertIn("gid=5000", out)
+    self.assertEqual(err, "")
+    self.assertEqual(code, 0)
 
   def test_root_identity_with_fim_root(self):
     """Test that FIM_ROOT automatically configures root identity"""
@@ -170,20 +183,25 @@ class TestFimEnvIdentity(EnvTestBase):
     self.assertIn("Included variable 'GID' with value '0'", out)
     self.assertEqual(err, "")
     self.assertEqual(code, 0)
+    uid, user, home, passwd = run_batch(self.file_image,
+      ["id", "-u"],
+      ["whoami"],
+      ["sh", "-c", "echo $HOME"],
+      ["cat", "/etc/passwd"])
     # Verify UID is 0
-    out,err,code = run_cmd(self.file_image, "fim-exec", "id", "-u")
+    out,err,code = uid
     self.assertEqual(out, "0")
     self.assertEqual(code, 0)
     # Verify username is automatically "root"
-    out,err,code = run_cmd(self.file_image, "fim-exec", "whoami")
+    out,err,code = user
     self.assertEqual(out, "root")
     self.assertEqual(code, 0)
     # home should be un-changed
-    out,err,code = run_cmd(self.file_image, "fim-exec", "sh", "-c", "echo $HOME")
+    out,err,code = home
     self.assertEqual(out, "/root")
     self.assertEqual(code, 0)
     # Verify passwd entry for root
-    out,err,code = run_cmd(self.file_image, "fim-exec", "cat", "/etc/passwd")
+    out,err,code = passwd
     self.assertIn("root:x:0:0:root:/root:", out)
     self.assertEqual(code, 0)
 
@@ -262,20 +280,25 @@ class TestFimEnvIdentity(EnvTestBase):
 
   def test_default_behavior_no_custom_values(self):
     """Test default behavior when no identity variables are set"""
+    uid, gid, user, home = run_batch(self.file_image,
+      ["id", "-u"],
+      ["id", "-g"],
+      ["whoami"],
+      ["sh", "-c", "echo $HOME"])
     # Should have some UID (host UID)
-    out,_,code = run_cmd(self.file_image, "fim-exec", "id", "-u")
+    out,_,code = uid
     self.assertEqual(int(out), os.getuid())
     self.assertEqual(code, 0)
     # Should have some GID (host GID)
-    out,_,code = run_cmd(self.file_image, "fim-exec", "id", "-g")
+    out,_,code = gid
     self.assertEqual(int(out), os.getgid())
     self.assertEqual(code, 0)
     # Should have a username (host username)
-    out,_,code = run_cmd(self.file_image, "fim-exec", "whoami")
+    out,_,code = user
     self.assertNotEqual(out, "")
     self.assertEqual(code, 0)
     # Should have HOME set
-    out,_,code = run_cmd(self.file_image, "fim-exec", "sh", "-c", "echo $HOME")
+    out,_,code = home
     self.assertEqual(out, os.environ["HOME"])
     self.assertEqual(code, 0)
 
@@ -5,6 +5,7 @@ import shutil
 import subprocess
 from .common import LayerTestBase
 from cli.test_runner import run_cmd
+from cli.test_base import fast_rmtree
 
 class TestFimLayerCommit(LayerTestBase):
   """Test suite for fim-layer commit command"""
@@ -28,28 +29,21 @@ class TestFimLayerCommit(LayerTestBase):
     self.assertIn("Filesystem appended to binary", out)
     self.assertEqual(code, 0)
     # Remove directory from host
-    shutil.rmtree(self.dir_image, ignore_errors=True)
+    fast_rmtree(self.dir_image)
     # Execute hello-world script which is compressed in the container
-    self.script_exec(content, "", 0)
     out,_,code = self.script_exec(content, "", 0)
-    os.environ["FIM_DEBUG"] = "1"
-    dbg,_,code = self.script_exec(None, "", 0)
-    os.environ["FIM_DEBUG"] = "0"
-    return (out, dbg.splitlines())
+    return out
 
   def test_commit(self):
     """Test committing changes to new layers"""
-    count_layers=1
-    for i in ["hello world", "second layer", "third layer"]:
+    contents = ["hello world", "second layer", "third layer"]
+    for i in contents:
       # Check if top-most layer is the one committed
-      (output, debug) = self.commit(i)
-      self.assertIn(i, output)
-      # Count number of overlay layers in debug output
-      overlays = set()
-      [overlays.add(line) for line in debug if "Overlay layer" in line]
-      self.assertEqual(len(overlays), count_layers+1)
-      shutil.rmtree(self.dir_image, ignore_errors=True)
-      count_layers += 1
+      self.assertIn(i, self.commit(i))
+    # Count number of overlay layers in debug output, the base layer plus one per commit
+    debug,_,_ = run_cmd(self.file_image, "fim-exec", "sh", "-c", "hello-world.sh", env={**os.environ, "FIM_DEBUG": "1"})
+    overlays = {line for line in debug.splitlines() if "Overlay layer" in line}
+    self.assertEqual(len(overlays), len(contents)+1)
 
   def test_commit_to_file(self):
     """Test committing changes to a separate layer file"""
@@ -20,10 +20,6 @@ class LayerTestBase(TestBase):
   def setUp(self):
     super().setUp()
 
-  def tearDown(self):
-    super().tearDown()
-    shutil.rmtree(self.dir_image, ignore_errors=True)
-
   def create_script(self, content, dir_root=None):
     """Create a test script in the image directory"""
     if not dir_root:
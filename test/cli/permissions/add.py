@@ -23,16 +23,16 @@ class TestFimPermsAdd(PermsTestBase):
     self.home_custom.mkdir(parents=True, exist_ok=True)
     with open(self.home_custom / "file", "w") as f:
       f.write("secret\n")
-    os.environ["HOME"] = str(self.home_custom)
-    run_cmd(self.file_image, "fim-perms", "add", "home")
-    out, err, code = run_cmd(self.file_image, "fim-exec", "cat", str(self.home_custom / "file"))
+    env = {**os.environ, "HOME": str(self.home_custom)}
+    run_cmd(self.file_image, "fim-perms", "add", "home", env=env)
+    out, err, code = run_cmd(self.file_image, "fim-exec", "cat", str(self.home_custom / "file"), env=env)
     self.assertEqual(out.strip(), "secret")
     self.assertEqual(len(out.strip().splitlines()), 1)
     self.assertEqual(err, "")
     self.assertEqual(code, 0)
 
-    run_cmd(self.file_image, "fim-perms", "del", "home")
-    out, err, code = run_cmd(self.file_image, "fim-exec", "cat", str(self.home_custom / "file"))
+    run_cmd(self.file_image, "fim-perms", "del", "home", env=env)
+    out, err, code = run_cmd(self.file_image, "fim-exec", "cat", str(self.home_custom / "file"), env=env)
     self.assertEqual(out, "")
     self.assertIn("No such file or directory", err)
     self.assertEqual(len(err.strip().splitlines()), 1)
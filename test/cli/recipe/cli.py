@@ -1,6 +1,7 @@
 #!/bin/python3
 
 from .common import RecipeTestBase
+from cli.test_base import keeps_image
 from cli.test_runner import run_cmd
 
 class TestFimRecipeCLI(RecipeTestBase):
@@ -15,6 +16,7 @@ class TestFimRecipeCLI(RecipeTestBase):
   # CLI Validation Tests
   # ===========================================================================
 
+  @keeps_image
   def test_recipe_no_subcommand(self):
     """Test fim-recipe with no subcommand"""
     out, err, code = run_cmd(self.file_image, "fim-recipe")
@@ -22,6 +24,7 @@ class TestFimRecipeCLI(RecipeTestBase):
     self.assertIn("Missing op for 'fim-recipe'", err)
     self.assertEqual(code, 125)
 
+  @keeps_image
   def test_recipe_invalid_subcommand(self):
     """Test fim-recipe with invalid subcommand"""
     out, err, code = run_cmd(self.file_image, "fim-recipe", "invalid-cmd")
@@ -29,6 +32,7 @@ class TestFimRecipeCLI(RecipeTestBase):
     self.assertIn("Invalid recipe operation", err)
     self.assertEqual(code, 125)
 
+  @keeps_image
   def test_recipe_missing_recipe_name(self):
     """Test fim-recipe fetch with no recipe name"""
     out, err, code = run_cmd(self.file_image, "fim-recipe", "fetch")
@@ -36,6 +40,7 @@ class TestFimRecipeCLI(RecipeTestBase):
     self.assertIn("Missing recipe", err)
     self.assertEqual(code, 125)
 
+  @keeps_image
   def test_recipe_trailing_arguments(self):
     """Test fim-recipe with trailing unexpected arguments"""
     out, err, code = run_cmd(self.file_image, "fim-recipe", "fetch", "test-recipe", "extra-arg")
@@ -47,6 +52,7 @@ class TestFimRecipeCLI(RecipeTestBase):
   # Edge Cases and Error Handling
   # ===========================================================================
 
+  @keeps_image
   def test_recipe_empty_name(self):
     """Test recipe commands with empty name"""
     out, err, code = run_cmd(self.file_image, "fim-recipe", "fetch", "")
@@ -54,6 +60,7 @@ class TestFimRecipeCLI(RecipeTestBase):
     self.assertIn("Recipe argument is empty", err)
     self.assertEqual(code, 125)
 
+  @keeps_image
   def test_recipe_whitespace_only_name(self):
     """Test recipe commands with whitespace-only name"""
     out, err, code = run_cmd(self.file_image, "fim-recipe", "info", "   ")
@@ -18,9 +18,10 @@ class RecipeTestBase(TestBase):
 
   def setUp(self):
     super().setUp()
-    # Set up remote URL for recipe tests
-    run_cmd(self.file_image, "fim-remote", "set", self.remote_url)
-    run_cmd(self.file_image, "fim-perms", "add", "network")
+    # Set up remote URL for recipe tests, a reused image is already configured
+    if not self.image_reused:
+      run_cmd(self.file_image, "fim-remote", "set", self.remote_url)
+      run_cmd(self.file_image, "fim-perms", "add", "network")
 
   def get_distribution(self):
     """Get the distribution name from the image"""
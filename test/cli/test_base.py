@@ -1,8 +1,46 @@
-from genericpath import exists
 import unittest
 import os
+import uuid
 import shutil
+import subprocess
 from pathlib import Path
+from cli.test_runner import copy_image
+
+# Background 'rm' processes started by fast_rmtree
+_rmtree_procs = []
+
+def fast_rmtree(path):
+  """
+  Move a directory out of the way and remove it with a background 'rm -rf',
+  the path is free to be re-created as soon as this returns
+  """
+  path = Path(path)
+  path_trash = path.with_name(f"{path.name}.trash.{uuid.uuid4().hex}")
+  try:
+    os.rename(path, path_trash)
+  except FileNotFoundError:
+    return
+  except OSError:
+    shutil.rmtree(path, ignore_errors=True)
+    return
+  _rmtree_procs.append(subprocess.Popen(
+    ["rm", "-rf", str(path_trash)],
+    stdout=subprocess.DEVNULL,
+    stderr=subprocess.DEVNULL
+  ))
+
+def wait_rmtree():
+  """Wait for the directories passed to fast_rmtree to be removed"""
+  while _rmtree_procs:
+    _rmtree_procs.pop().wait()
+
+def keeps_image(test):
+  """
+  Mark a test that leaves the image and its data directory untouched, the next
+  test of the same class reuses them instead of provisioning a fresh copy
+  """
+  test.keeps_image = True
+  return test
 
 class TestBase(unittest.TestCase):
   """
@@ -18,41 +56,68 @@ class TestBase(unittest.TestCase):
     cls.file_image_src = os.environ["FILE_IMAGE_SRC"]
     cls.dir_image = Path(os.environ["DIR_IMAGE"])
     cls.dir_data = Path(os.environ["DIR_DATA"])
+    cls.path_image = Path(cls.file_image)
+    cls.name_image = cls.path_image.name
+    cls.file_image_temp = cls.path_image.parent / "temp.flatimage"
     # Desktop integration
     cls.file_desktop = cls.dir_data / "desktop.json"
     cls.dir_xdg = cls.dir_data / "xdg_data_home"
+    # Set when the previous test left a reusable image
+    cls.image_kept = False
+
+  @classmethod
+  def tearDownClass(cls):
+    # Remove the image kept by the last test
+    if cls.image_kept:
+      cls.remove_image()
+    # Do not leave removals running past the class
+    wait_rmtree()
+
+  @classmethod
+  def remove_image(cls):
+    """Remove the image and its data directory, the next test provisions a fresh copy"""
+    cls.path_image.unlink(missing_ok=True)
+    fast_rmtree(cls.dir_image)
+    cls.image_kept = False
+
+  def run(self, result=None):
+    if result is None:
+      result = self.defaultTestResult()
+    problems = len(result.failures) + len(result.errors)
+    super().run(result)
+    # A test that failed may have modified the image with a command that should have
+    # been rejected, do not let the next test reuse it
+    if type(self).image_kept and len(result.failures) + len(result.errors) != problems:
+      self.remove_image()
+    return result
 
   def setUp(self):
     # Erase data dir
     self.dir_data.mkdir(parents=True, exist_ok=True)
-    # Copy fresh image and chmod +x
-    shutil.copy(self.file_image_src, self.file_image)
-    os.chmod(self.file_image, 0o755)
+    # Copy fresh image and chmod +x, unless the previous test kept it untouched
+    self.image_reused = self.image_kept and self.path_image.exists()
+    if not self.image_reused:
+      copy_image(self.file_image_src, self.file_image)
     # Re-create an empty alternative XDG_DATA_HOME
-    shutil.rmtree(self.dir_xdg, ignore_errors=True)
+    fast_rmtree(self.dir_xdg)
     self.dir_xdg.mkdir(parents=True, exist_ok=False)
 
   def tearDown(self):
-    # Disable debugging
-    os.environ["FIM_DEBUG"] = "0"
-    # Remove image file an data directory
-    os.unlink(self.file_image)
-    shutil.rmtree(self.dir_image, ignore_errors=True)
+    # Disable debugging, most tests never enable it
+    if os.environ.get("FIM_DEBUG") != "0":
+      os.environ["FIM_DEBUG"] = "0"
+    # Remove image file an data directory, unless the test kept them untouched, run
+    # removes them afterwards if the test failed
+    type(self).image_kept = getattr(getattr(self, self._testMethodName), "keeps_image", False)
+    if not self.image_kept:
+      self.remove_image()
     # Remove custom XDG_DATA_HOME
-    shutil.rmtree(self.dir_xdg, ignore_errors=True)
-    # Remove desktop integration items
-    if self.file_desktop.exists():
-      os.unlink(self.file_desktop)
-    file_png = self.dir_data / "out.png"
-    if file_png.exists():
-      os.unlink(file_png)
-    file_svg = self.dir_data / "out.svg"
-    if file_svg.exists():
-      os.unlink(file_svg)
-    # Remove temporary image file
-    file_image_temp = Path(self.file_image).parent / "temp.flatimage"
-    if file_image_temp.exists():
-      os.unlink(file_image_temp)
-    image_dir = Path(self.file_image).parent / ".temp.flatimage.data"
-    if image_dir.exists():
-      shutil.rmtree(image_dir)
\ No newline at end of file
+    fast_rmtree(self.dir_xdg)
+    # Remove desktop integration items and the temporary image with its data
+    # directory, all of them live in the data directory so it is listed once
+    with os.scandir(self.dir_data) as entries:
+      for entry in entries:
+        if entry.name in ("desktop.json", "out.png", "out.svg", "temp.flatimage"):
+          os.unlink(entry.path)
+        elif entry.name == ".temp.flatimage.data":
+          shutil.rmtree(entry.path)
\ No newline at end of file
@@ -7,8 +7,69 @@ including command execution helpers and common test patterns.
 """
 
 import os
+import time
+import fcntl
+import shlex
+import uuid
+import shutil
+import selectors
 import subprocess
-from typing import Tuple, Optional, Dict
+from typing import List, Tuple, Optional, Dict
+
+# Prefer orjson to parse the JSON printed by the CLI, when it is installed
+try:
+    from orjson import loads as json_loads
+except ImportError:
+    from json import loads as json_loads
+
+
+# ioctl request to share the extents of a file with another (reflink)
+FICLONE = 0x40049409
+
+# Seconds a command of an ExecSession may run before the session is killed
+EXEC_TIMEOUT = 300
+
+# Descriptors opened by Python are not inheritable (PEP 446), so the children do not
+# need close_fds to scrub them, which also lets subprocess start them with posix_spawn
+CLOSE_FDS = False
+
+
+def copy_image(src: str, dst: str) -> None:
+    """
+    Copy a FlatImage binary and make it executable.
+
+    The copy is a reflink when the filesystem supports it (btrfs, xfs, ...), so no
+    data is duplicated until one of the files is modified; otherwise it falls back
+    to copy_file_range, which keeps the data in the kernel, and lastly to a
+    regular copy.
+
+    Args:
+        src: Path to the pristine FlatImage binary
+        dst: Path to the copy used by the test
+    """
+    try:
+        with open(src, "rb") as file_src, open(dst, "wb") as file_dst:
+            fcntl.ioctl(file_dst.fileno(), FICLONE, file_src.fileno())
+    except OSError:
+        _copy_file_range(src, dst)
+    os.chmod(dst, 0o755)
+
+
+def _copy_file_range(src: str, dst: str) -> None:
+    """Copy with os.copy_file_range, falling back to shutil.copyfile if unsupported."""
+    try:
+        with open(src, "rb") as file_src, open(dst, "wb") as file_dst:
+            remaining = os.fstat(file_src.fileno()).st_size
+            while remaining > 0:
+                copied = os.copy_file_range(file_src.fileno(), file_dst.fileno(), remaining)
+                if copied == 0:
+                    break
+                remaining -= copied
+        if remaining == 0:
+            return
+    except (OSError, AttributeError):
+        pass
+    shutil.copyfile(src, dst)
 
 
 def run_cmd(file_image: str, *args, env: Optional[Dict[str, str]] = None) -> Tuple[str, str, int]:
@@ -18,7 +79,7 @@ def run_cmd(file_image: str, *args, env: Optional[Dict[str, str]] = None) -> Tup
     Args:
         file_image: Path to the FlatImage binary
         *args: Command arguments to pass to the binary
-        env: Optional environment variables (defaults to os.environ.copy())
+        env: Optional environment variables (defaults to the environment of the test process)
     
     Returns:
         Tuple of (stdout, stderr, returncode) where stdout and stderr are stripped
@@ -28,13 +89,13 @@ def run_cmd(file_image: str, *args, env: Optional[Dict[str, str]] = None) -> Tup
         >>> print(out)
     """
     result = subprocess.run(
-        [file_image] + list(args),
+        (file_image, *args),
         stdout=subprocess.PIPE,
         stderr=subprocess.PIPE,
-        text=True,
-        env=env or os.environ.copy()
+        env=env,
+        close_fds=CLOSE_FDS
     )
-    return (result.stdout.strip(), result.stderr.strip(), result.returncode)
+    return (result.stdout.decode().strip(), result.stderr.decode().strip(), result.returncode)
 
 
 def run_cmd_with_stdin(file_image: str, *args, env: Optional[Dict[str, str]] = None) -> Tuple[str, str, int]:
@@ -44,7 +105,7 @@ def run_cmd_with_stdin(file_image: str, *args, env: Optional[Dict[str, str]] = N
     Args:
         file_image: Path to the FlatImage binary
         *args: Command arguments to pass to the binary
-        env: Optional environment variables (defaults to os.environ.copy())
+        env: Optional environment variables (defaults to the environment of the test process)
     
     Returns:
         Tuple of (stdout, stderr, returncode) where stdout and stderr are stripped
@@ -54,14 +115,14 @@ def run_cmd_with_stdin(file_image: str, *args, env: Optional[Dict[str, str]] = N
         >>> print(out)
     """
     result = subprocess.run(
-        [file_image] + list(args),
+        (file_image, *args),
         stdout=subprocess.PIPE,
         stderr=subprocess.PIPE,
         stdin=subprocess.PIPE,
-        env=env or os.environ.copy(),
-        text=True
+        env=env,
+        close_fds=CLOSE_FDS
     )
-    return (result.stdout.strip(), result.stderr.strip(), result.returncode)
+    return (result.stdout.decode().strip(), result.stderr.decode().strip(), result.returncode)
 
 
 def spawn_cmd(file_image: str, *args) -> subprocess.Popen:
@@ -81,9 +142,143 @@ def spawn_cmd(file_image: str, *args) -> subprocess.Popen:
         >>> proc.kill()
     """
     return subprocess.Popen(
-        ["bash", "-c", f"{file_image} $@", "--"] + list(args),
+        ["bash", "-c", f"{file_image} $@", "--", *args],
         stdout=subprocess.PIPE,
         stderr=subprocess.STDOUT,
         stdin=subprocess.PIPE,
-        env=os.environ.copy()
+        close_fds=CLOSE_FDS
     )
+
+
+class ExecSession:
+    """
+    Persistent 'fim-exec bash' session used to run several commands in one container boot.
+
+    The configuration of the image (bindings, boot command, environment, ...) is read
+    when the session starts, so commands that modify it ('fim-bind', 'fim-boot', ...)
+    must still go through run_cmd, and a new session must be started afterwards.
+
+    Args:
+        file_image: Path to the FlatImage binary
+        env: Optional environment variables (defaults to the environment of the test process)
+
+    Example:
+        >>> with ExecSession("/path/to/app.flatimage") as session:
+        ...     out, err, code = session.run("cat", "/etc/os-release")
+    """
+
+    def __init__(self, file_image: str, env: Optional[Dict[str, str]] = None):
+        self.marker = f"__FIM_DONE_{uuid.uuid4().hex}__"
+        self.proc = subprocess.Popen(
+            [file_image, "fim-exec", "bash"],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            stdin=subprocess.PIPE,
+            env=env,
+            close_fds=CLOSE_FDS
+        )
+        # Bytes read past the marker of the previous command, per stream
+        self.pending = {self.proc.stdout: b"", self.proc.stderr: b""}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_):
+        self.close()
+
+    def _take_until_marker(self, stream) -> Optional[Tuple[str, str]]:
+        """Split the bytes read from stream at the marker line, returns (contents, marker line) or None"""
+        data = self.pending[stream]
+        begin = data.find(f"\n{self.marker}".encode())
+        end = data.find(b"\n", begin + 1) if begin >= 0 else -1
+        if end < 0:
+            return None
+        self.pending[stream] = data[end + 1:]
+        return (data[:begin].decode(), data[begin + 1:end].decode())
+
+    def _read_until_markers(self, timeout: Optional[float]) -> Tuple[Tuple[str, str], Tuple[str, str]]:
+        """Read stdout and stderr together until both reach the marker, so neither pipe fills up"""
+        results = {stream: self._take_until_marker(stream) for stream in self.pending}
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with selectors.DefaultSelector() as selector:
+            for stream, result in results.items():
+                if result is None:
+                    selector.register(stream, selectors.EVENT_READ)
+            while any(result is None for result in results.values()):
+                remaining = None if deadline is None else deadline - time.monotonic()
+                events = selector.select(remaining) if remaining is None or remaining > 0 else []
+                if not events:
+                    self.proc.kill()
+                    raise TimeoutError(f"fim-exec session command did not finish in {timeout} seconds")
+                for key, _ in events:
+                    data = os.read(key.fd, 65536)
+                    if not data:
+                        raise RuntimeError("fim-exec session exited before the command finished")
+                    self.pending[key.fileobj] += data
+                    results[key.fileobj] = self._take_until_marker(key.fileobj)
+                    if results[key.fileobj] is not None:
+                        selector.unregister(key.fileobj)
+        return (results[self.proc.stdout], results[self.proc.stderr])
+
+    def run(self, *args, timeout: Optional[float] = EXEC_TIMEOUT) -> Tuple[str, str, int]:
+        """
+        Execute a command in the running container.
+
+        Args:
+            *args: Command and its arguments, quoted before being sent to the shell
+            timeout: Seconds to wait for the command, the session is killed once it expires
+
+        Returns:
+            Tuple of (stdout, stderr, returncode) where stdout and stderr are stripped
+
+        Raises:
+            TimeoutError: The command did not finish in time
+        """
+        # The command must not read the commands that follow it from the shell's stdin
+        command = shlex.join(str(arg) for arg in args)
+        self.proc.stdin.write(
+            f"{command} </dev/null; printf '\\n%s %d\\n' {self.marker} $?; printf '\\n%s\\n' {self.marker} >&2\n".encode()
+        )
+        self.proc.stdin.flush()
+        (out, line), (err, _) = self._read_until_markers(timeout)
+        return (out.strip(), err.strip(), int(line.split()[1]))
+
+    def close(self) -> int:
+        """
+        Terminate the shell and wait for the container to exit.
+
+        Returns:
+            Exit code of the 'fim-exec' process
+        """
+        if self.proc.poll() is None:
+            try:
+                self.proc.stdin.close()
+            except BrokenPipeError:
+                pass
+        code = self.proc.wait()
+        self.proc.stdout.close()
+        self.proc.stderr.close()
+        return code
+
+
+def run_batch(file_image: str, *commands, env: Optional[Dict[str, str]] = None) -> List[Tuple[str, str, int]]:
+    """
+    Execute several commands in the container of the FlatImage with a single boot.
+
+    Each command is a sequence of arguments, as they would be passed to
+    'fim-exec'. Output emitted while the container boots is reported with the
+    first command, like run_cmd reports it with its only command.
+
+    Args:
+        file_image: Path to the FlatImage binary
+        *commands: Commands to run in order, e.g. ["id", "-u"], ["whoami"]
+        env: Optional environment variables (defaults to the environment of the test process)
+
+    Returns:
+        List of (stdout, stderr, returncode) tuples, one for each command
+
+    Example:
+        >>> (uid, _, _), (user, _, _) = run_batch(file_image, ["id", "-u"], ["whoami"])
+    """
+    with ExecSession(file_image, env=env) as session:
+        return [session.run(*command) for command in commands]
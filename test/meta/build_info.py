@@ -1,11 +1,11 @@
 #!/bin/python3
 
 import os
-import subprocess
 import unittest
 import shutil
 import pathlib
 import json
+from cli.test_runner import run_cmd
 
 class TestFimBuildInfo(unittest.TestCase):
 
@@ -16,23 +16,13 @@ class TestFimBuildInfo(unittest.TestCase):
 
   def tearDown(self):
     shutil.rmtree(self.dir_image, ignore_errors=True)
-    
-  def run_cmd(self, *args, env=None):
-    result = subprocess.run(
-      [self.file_image] + list(args),
-      stdout=subprocess.PIPE,
-      stderr=subprocess.STDOUT,
-      text=True,
-      env=env or os.environ.copy()
-    )
-    return result.stdout.strip()
 
   def test_version(self):
-    output = self.run_cmd("fim-version")
+    output = run_cmd(self.file_image, "fim-version")[0]
     self.assertRegex(output, r"^v\d+\.\d+\.\d+$", msg=f"Invalid version format: {output}")
 
   def test_version_full(self):
-    output = self.run_cmd("fim-version-full")
+    output = run_cmd(self.file_image, "fim-version-full")[0]
     try:
       data = json.loads(output)
     except json.JSONDecodeError as e:
@@ -6,6 +6,9 @@ import shutil
 import unittest
 from pathlib import Path
 
+# The shared command helpers live in the CLI test package, next to this suite
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
 import magic
 import build_info
 
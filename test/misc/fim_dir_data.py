@@ -4,7 +4,7 @@ import os
 import shutil
 import unittest
 from pathlib import Path
-from cli.test_runner import run_cmd
+from cli.test_runner import run_cmd, copy_image
 
 class TestFimDirData(unittest.TestCase):
   """
@@ -21,6 +21,7 @@ class TestFimDirData(unittest.TestCase):
     cls.dir_script = Path(__file__).resolve().parent.parent
     # FlatImage and its data directories
     cls.file_image = os.environ["FILE_IMAGE"]
+    cls.path_image = Path(cls.file_image)
     cls.file_image_src = os.environ["FILE_IMAGE_SRC"]
     cls.dir_data = Path(os.environ["DIR_DATA"])
     cls.dir_image = Path(os.environ["DIR_IMAGE"])
@@ -33,13 +34,11 @@ class TestFimDirData(unittest.TestCase):
     # Ensure data directories exist
     self.dir_data.mkdir(parents=True, exist_ok=True)
     # Copy fresh image and chmod +x
-    shutil.copy(self.file_image_src, self.file_image)
-    os.chmod(self.file_image, 0o755)
+    copy_image(self.file_image_src, self.file_image)
 
   def tearDown(self):
     # Remove image file
-    if Path(self.file_image).exists():
-      os.unlink(self.file_image)
+    self.path_image.unlink(missing_ok=True)
     # Remove data directories
     shutil.rmtree(self.dir_data_1, ignore_errors=True)
     shutil.rmtree(self.dir_data_2, ignore_errors=True)
@@ -189,7 +188,7 @@ class TestFimDirData(unittest.TestCase):
     self.assertEqual(code, 0, f"Failed to write file with default dir: {err}")
 
     # Verify the default data directory was created
-    default_data_dir = Path(self.file_image).parent / f".{Path(self.file_image).name}.data"
+    default_data_dir = self.path_image.parent / f".{self.path_image.name}.data"
     self.assertTrue(default_data_dir.exists(),
                     f"Default data directory should exist at {default_data_dir}")
 
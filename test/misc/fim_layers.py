@@ -4,7 +4,7 @@ import os
 import shutil
 import unittest
 from pathlib import Path
-from cli.test_runner import run_cmd
+from cli.test_runner import run_cmd, copy_image
 
 class TestFimLayers(unittest.TestCase):
   """
@@ -21,6 +21,7 @@ class TestFimLayers(unittest.TestCase):
     cls.dir_script = Path(__file__).resolve().parent.parent
     # FlatImage and its data directories
     cls.file_image = os.environ["FILE_IMAGE"]
+    cls.path_image = Path(cls.file_image)
     cls.file_image_src = os.environ["FILE_IMAGE_SRC"]
     cls.dir_data = Path(os.environ["DIR_DATA"])
     cls.dir_image = Path(os.environ["DIR_IMAGE"])
@@ -38,15 +39,13 @@ class TestFimLayers(unittest.TestCase):
     self.dir_layers_apps.mkdir(parents=True, exist_ok=True)
 
     # Copy fresh image and chmod +x
-    shutil.copy(self.file_image_src, self.file_image)
-    os.chmod(self.file_image, 0o755)
+    copy_image(self.file_image_src, self.file_image)
 
   def tearDown(self):
     # Remove image file
-    if Path(self.file_image).exists():
-      os.unlink(self.file_image)
-    # Remove data directories
-    shutil.rmtree(self.dir_data, ignore_errors=True)
+    self.path_image.unlink(missing_ok=True)
+    # Remove layer directories, the data directory is shared with the other suites
+    shutil.rmtree(self.dir_layers, ignore_errors=True)
     # Remove default data directory
     shutil.rmtree(self.dir_image, ignore_errors=True)
 
@@ -1,16 +1,24 @@
 #!/usr/bin/env python3
 
+import io
 import os
 import sys
+import json
+import time
 import shutil
+import argparse
+import tempfile
 import unittest
 import importlib
+import multiprocessing
 from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
 
 # Bindings tests
 from cli.bindings.add import TestFimBindAdd
 from cli.bindings.list import TestFimBindList
 from cli.bindings.delete import TestFimBindDel
+from cli.bindings.change import TestFimBindChange
 
 # Boot tests
 from cli.boot.set import TestFimBootSet
@@ -96,92 +104,183 @@ from cli.version.short import TestFimVersionShort
 from misc.fim_dir_data import TestFimDirData
 from misc.fim_layers import TestFimLayers
 
-def suite():
-  suite = unittest.TestSuite()
+from cli.test_runner import copy_image
+
+# Resolve script directory
+DIR_SCRIPT = Path(os.path.dirname(__file__))
+DIR_SCRIPT_DATA = DIR_SCRIPT / "data"
+# Duration of each TestCase class in the last parallel run, used to start the slowest first
+FILE_DURATIONS = DIR_SCRIPT / ".durations.json"
+
+TEST_CASES = [
   # Bindings tests
-  suite.addTest(unittest.TestLoader().loadTestsFromTestCase(TestFimBindAdd))
-  suite.addTest(unittest.TestLoader().loadTestsFromTestCase(TestFimBindList))
-  suite.addTest(unittest.TestLoader().loadTestsFromTestCase(TestFimBindDel))
+  TestFimBindAdd,
+  TestFimBindList,
+  TestFimBindDel,
+  TestFimBindChange,
   # Boot tests
-  suite.addTest(unittest.TestLoader().loadTestsFromTestCase(TestFimBootSet))
-  suite.addTest(unittest.TestLoader().loadTestsFromTestCase(TestFimBootShow))
-  suite.addTest(unittest.TestLoader().loadTestsFromTestCase(TestFimBootClear))
-  suite.addTest(unittest.TestLoader().loadTestsFromTestCase(TestFimBootCLI))
+  TestFimBootSet,
+  TestFimBootShow,
+  TestFimBootClear,
+  TestFimBootCLI,
   # Casefold tests
-  suite.addTest(unittest.TestLoader().loadTestsFromTestCase(TestFimCasefoldOn))
-  suite.addTest(unittest.TestLoader().loadTestsFromTestCase(TestFimCasefoldOff))
+  TestFimCasefoldOn,
+  TestFimCasefoldOff,
   # Desktop tests
-  suite.addTest(unittest.TestLoader().loadTestsFromTestCase(TestFimDesktopSetup))
-  suite.addTest(unittest.TestLoader().loadTestsFromTestCase(TestFimDesktopEnable))
-  suite.addTest(unittest.TestLoader().loadTestsFromTestCase(TestFimDesktopDump))
-  suite.addTest(unittest.TestLoader().loadTestsFromTestCase(TestFimDesktopClean))
+  TestFimDesktopSetup,
+  TestFimDesktopEnable,
+  TestFimDesktopDump,
+  TestFimDesktopClean,
   # Environment tests
-  suite.addTest(unittest.TestLoader().loadTestsFromTestCase(TestFimEnvAdd))
-  suite.addTest(unittest.TestLoader().loadTestsFromTestCase(TestFimEnvDel))
-  suite.addTest(unittest.TestLoader().loadTestsFromTestCase(TestFimEnvList))
-  suite.addTest(unittest.TestLoader().loadTestsFromTestCase(TestFimEnvClear))
-  suite.addTest(unittest.TestLoader().loadTestsFromTestCase(TestFimEnvSet))
-  suite.addTest(unittest.TestLoader().loadTestsFromTestCase(TestFimEnvCli))
-  suite.addTest(unittest.TestLoader().loadTestsFromTestCase(TestFimEnvIdentity))
+  TestFimEnvAdd,
+  TestFimEnvDel,
+  TestFimEnvList,
+  TestFimEnvClear,
+  TestFimEnvSet,
+  TestFimEnvCli,
+  TestFimEnvIdentity,
   # Exec tests
-  suite.addTest(unittest.TestLoader().loadTestsFromTestCase(TestFimExec))
+  TestFimExec,
   # Instance tests
-  suite.addTest(unittest.TestLoader().loadTestsFromTestCase(TestFimInstanceCli))
-  suite.addTest(unittest.TestLoader().loadTestsFromTestCase(TestFimInstanceExec))
-  suite.addTest(unittest.TestLoader().loadTestsFromTestCase(TestFimInstanceList))
+  TestFimInstanceCli,
+  TestFimInstanceExec,
+  TestFimInstanceList,
   # Layer tests
-  suite.addTest(unittest.TestLoader().loadTestsFromTestCase(TestFimLayerCommit))
-  suite.addTest(unittest.TestLoader().loadTestsFromTestCase(TestFimLayerCreate))
-  suite.addTest(unittest.TestLoader().loadTestsFromTestCase(TestFimLayerList))
+  TestFimLayerCommit,
+  TestFimLayerCreate,
+  TestFimLayerList,
   # Overlay tests
-  suite.addTest(unittest.TestLoader().loadTestsFromTestCase(TestFimOverlaySet))
-  suite.addTest(unittest.TestLoader().loadTestsFromTestCase(TestFimOverlayShow))
+  TestFimOverlaySet,
+  TestFimOverlayShow,
   # Permissions tests
-  suite.addTest(unittest.TestLoader().loadTestsFromTestCase(TestFimPermsAdd))
-  suite.addTest(unittest.TestLoader().loadTestsFromTestCase(TestFimPermsDel))
-  suite.addTest(unittest.TestLoader().loadTestsFromTestCase(TestFimPermsList))
-  suite.addTest(unittest.TestLoader().loadTestsFromTestCase(TestFimPermsClear))
-  suite.addTest(unittest.TestLoader().loadTestsFromTestCase(TestFimPermsSet))
+  TestFimPermsAdd,
+  TestFimPermsDel,
+  TestFimPermsList,
+  TestFimPermsClear,
+  TestFimPermsSet,
   # Portal tests
-  suite.addTest(unittest.TestLoader().loadTestsFromTestCase(TestFimPortal))
+  TestFimPortal,
   # Recipe tests
-  suite.addTest(unittest.TestLoader().loadTestsFromTestCase(TestFimRecipeCLI))
-  suite.addTest(unittest.TestLoader().loadTestsFromTestCase(TestFimRecipeFetch))
-  suite.addTest(unittest.TestLoader().loadTestsFromTestCase(TestFimRecipeInfo))
-  suite.addTest(unittest.TestLoader().loadTestsFromTestCase(TestFimRecipeInstall))
+  TestFimRecipeCLI,
+  TestFimRecipeFetch,
+  TestFimRecipeInfo,
+  TestFimRecipeInstall,
   # Remote tests
-  suite.addTest(unittest.TestLoader().loadTestsFromTestCase(TestFimRemoteCli))
-  suite.addTest(unittest.TestLoader().loadTestsFromTestCase(TestFimRemoteSet))
-  suite.addTest(unittest.TestLoader().loadTestsFromTestCase(TestFimRemoteShow))
-  suite.addTest(unittest.TestLoader().loadTestsFromTestCase(TestFimRemoteClear))
-  suite.addTest(unittest.TestLoader().loadTestsFromTestCase(TestFimRemoteWorkflow))
+  TestFimRemoteCli,
+  TestFimRemoteSet,
+  TestFimRemoteShow,
+  TestFimRemoteClear,
+  TestFimRemoteWorkflow,
   # Root tests
-  suite.addTest(unittest.TestLoader().loadTestsFromTestCase(TestFimRoot))
+  TestFimRoot,
   # Unshare tests
-  suite.addTest(unittest.TestLoader().loadTestsFromTestCase(TestFimUnshareAdd))
-  suite.addTest(unittest.TestLoader().loadTestsFromTestCase(TestFimUnshareSet))
-  suite.addTest(unittest.TestLoader().loadTestsFromTestCase(TestFimUnshareDel))
-  suite.addTest(unittest.TestLoader().loadTestsFromTestCase(TestFimUnshareClear))
-  suite.addTest(unittest.TestLoader().loadTestsFromTestCase(TestFimUnshareList))
+  TestFimUnshareAdd,
+  TestFimUnshareSet,
+  TestFimUnshareDel,
+  TestFimUnshareClear,
+  TestFimUnshareList,
   # Version tests
-  suite.addTest(unittest.TestLoader().loadTestsFromTestCase(TestFimVersionDeps))
-  suite.addTest(unittest.TestLoader().loadTestsFromTestCase(TestFimVersionFull))
-  suite.addTest(unittest.TestLoader().loadTestsFromTestCase(TestFimVersionShort))
+  TestFimVersionDeps,
+  TestFimVersionFull,
+  TestFimVersionShort,
   # Misc tests
-  suite.addTest(unittest.TestLoader().loadTestsFromTestCase(TestFimDirData))
-  suite.addTest(unittest.TestLoader().loadTestsFromTestCase(TestFimLayers))
+  TestFimDirData,
+  TestFimLayers,
+]
+
+def suite():
+  suite = unittest.TestSuite()
+  for test_case in TEST_CASES:
+    suite.addTest(unittest.TestLoader().loadTestsFromTestCase(test_case))
   return suite
 
+def worker_init(queue_dir_data):
+  # Each worker owns a data directory, image copy and image data directory, the
+  # icons read by the desktop tests are copied once as no test removes them
+  dir_data = queue_dir_data.get()
+  dir_data.mkdir(parents=True, exist_ok=True)
+  for file_icon in DIR_SCRIPT_DATA.glob("icon.*"):
+    shutil.copy(file_icon, dir_data / file_icon.name)
+  os.environ["DIR_DATA"] = str(dir_data)
+  os.environ["FILE_IMAGE"] = str(dir_data / "app.flatimage")
+  os.environ["DIR_IMAGE"] = str(dir_data / ".app.flatimage.data")
+
+def worker_run(test_case):
+  stream = io.StringIO()
+  start = time.monotonic()
+  result = unittest.TextTestRunner(stream=stream, verbosity=2).run(
+    unittest.TestLoader().loadTestsFromTestCase(test_case)
+  )
+  elapsed = time.monotonic() - start
+  return (stream.getvalue(), result.testsRun, len(result.failures), len(result.errors), elapsed)
+
+def run_parallel(jobs):
+  """Run the test cases across 'jobs' worker processes, one TestCase class at a time"""
+  # Longest first, so a slow class does not start last and run alone, classes without a
+  # recorded duration are assumed to be slow
+  try:
+    durations = json.loads(FILE_DURATIONS.read_text())
+  except (OSError, ValueError):
+    durations = {}
+  test_cases = sorted(TEST_CASES, key=lambda test_case: durations.get(test_case.__name__, float("inf")), reverse=True)
+  manager = multiprocessing.Manager()
+  queue_dir_data = manager.Queue()
+  dirs_data = [Path(os.environ["DIR_DATA"]) / f"worker-{i}" for i in range(jobs)]
+  for dir_data in dirs_data:
+    queue_dir_data.put(dir_data)
+  tests, failures, errors = 0, 0, 0
+  with ProcessPoolExecutor(max_workers=jobs, initializer=worker_init, initargs=(queue_dir_data,)) as executor:
+    for test_case, (output, run, failed, errored, elapsed) in zip(test_cases, executor.map(worker_run, test_cases)):
+      print(output, file=sys.stderr, end="")
+      tests, failures, errors = tests + run, failures + failed, errors + errored
+      durations[test_case.__name__] = round(elapsed, 3)
+  FILE_DURATIONS.write_text(json.dumps(durations, indent=2, sort_keys=True))
+  for dir_data in dirs_data:
+    shutil.rmtree(dir_data, ignore_errors=True)
+  print(f"Ran {tests} tests in {jobs} workers", file=sys.stderr)
+  if failures or errors:
+    print(f"FAILED (failures={failures}, errors={errors})", file=sys.stderr)
+  else:
+    print("OK", file=sys.stderr)
+
 if __name__ == '__main__':
-  # Resolve script directory
-  DIR_SCRIPT = Path(os.path.dirname(__file__))
   # Get input argument
   if len(sys.argv) < 2:
     print("Input image is missing", file=sys.stderr)
     sys.exit(1)
-  os.environ["FILE_IMAGE_SRC"] = sys.argv[1]
-  os.environ["DIR_DATA"] = str(DIR_SCRIPT / "data")
-  os.environ["FILE_IMAGE"] = str(DIR_SCRIPT / "data" / "app.flatimage")
-  os.environ["DIR_IMAGE"] = str(DIR_SCRIPT / "data" / ".app.flatimage.data")
-  runner = unittest.TextTestRunner(verbosity=2)
-  runner.run(suite())
\ No newline at end of file
+  parser = argparse.ArgumentParser(description="FlatImage CLI test suite")
+  parser.add_argument("image", help="Path to the source FlatImage")
+  parser.add_argument("-j", "--jobs", type=int, default=1,
+    help="Number of TestCase classes to run in parallel, each with its own data directory, 0 uses one per CPU")
+  parser.add_argument("--tmpfs", action="store_true",
+    help="Keep the image copies and their data directories in the temporary directory (TMPDIR)")
+  parser.add_argument("--tmpfs-dir", metavar="DIR",
+    help="Like --tmpfs but in DIR, e.g. /dev/shm, which must allow execution")
+  args = parser.parse_args()
+  if args.tmpfs_dir:
+    args.tmpfs = True
+  if args.jobs == 0:
+    args.jobs = os.cpu_count() or 1
+  # The image data directory is created next to the image, so both are moved
+  dir_data = DIR_SCRIPT_DATA
+  if args.tmpfs:
+    dir_data = Path(tempfile.mkdtemp(prefix="flatimage-test-", dir=args.tmpfs_dir))
+    for file_icon in DIR_SCRIPT_DATA.glob("icon.*"):
+      shutil.copy(file_icon, dir_data / file_icon.name)
+  # Tests copy the image from a template next to their copies, reflinks do not cross filesystems
+  file_image_template = dir_data / ".template.flatimage"
+  copy_image(args.image, str(file_image_template))
+  os.environ["FILE_IMAGE_SRC"] = str(file_image_template)
+  os.environ["DIR_DATA"] = str(dir_data)
+  os.environ["FILE_IMAGE"] = str(dir_data / "app.flatimage")
+  os.environ["DIR_IMAGE"] = str(dir_data / ".app.flatimage.data")
+  try:
+    if args.jobs > 1:
+      run_parallel(args.jobs)
+    else:
+      runner = unittest.TextTestRunner(verbosity=2)
+      runner.run(suite())
+  finally:
+    file_image_template.unlink(missing_ok=True)
+    if args.tmpfs:
+      shutil.rmtree(dir_data, ignore_errors=True)
\ No newline at end of file